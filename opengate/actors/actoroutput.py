@@ -1,7 +1,7 @@
-import copy
 import inspect
 from box import Box
 from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
 import sys
 
 import opengate_core as g4
@@ -59,6 +59,7 @@ class BaseUserInterfaceToActorOutput:
         docstring += get_formatted_docstring_rst(cls, "output_filename")
         docstring += get_formatted_docstring_rst(cls, "write_to_disk")
         docstring += get_formatted_docstring_rst(cls, "keep_data_per_run")
+        docstring += get_formatted_docstring_rst(cls, "parallel_write")
         return docstring
 
     @classmethod
@@ -183,6 +184,17 @@ class BaseUserInterfaceToActorOutput:
     def keep_data_per_run(self, value):
         self._user_output.keep_data_per_run = value
 
+    @property
+    def parallel_write(self):
+        """In case data is kept for individual runs, should it be written to disk in parallel threads?
+        Note: Not every kind of user output supports this, e.g. ROOT output is not stored on a per-run basis.
+        """
+        return self._user_output.parallel_write
+
+    @parallel_write.setter
+    def parallel_write(self, value):
+        self._user_output.parallel_write = value
+
     @property
     def suffix(self):
         """Specify the automatic suffix to be used for this output in case the output_filename is set
@@ -383,6 +395,21 @@ class ActorOutputBase(GateObject):
     def initialize(self):
         pass
 
+    def _get_run_index(self, which, method_name):
+        """Interpret the argument 'which' as a run index.
+        Integers, the common case, are returned directly without trying a conversion.
+        """
+        if isinstance(which, int):
+            return which
+        try:
+            return int(which)
+        except (ValueError, TypeError):
+            fatal(
+                f"Invalid argument 'which' in {method_name}() method "
+                f"of {type(self).__name__} called {self.name}. "
+                f"Valid arguments are a run index (int) or the term 'merged'. "
+            )
+
     def _generate_auto_output_filename(self, **kwargs):
         return f"{self.name}_from_{self.belongs_to_actor.type_name.lower()}_{self.belongs_to_actor.name}.{self.default_suffix}"
 
@@ -392,15 +419,7 @@ class ActorOutputBase(GateObject):
         if which == "merged":
             return full_data_path
         else:
-            try:
-                run_index = int(which)
-            except ValueError:
-                fatal(
-                    f"Invalid argument 'which' in get_output_path() method "
-                    f"of {type(self).__name__} called {self.name}"
-                    f"Valid arguments are a run index (int) or the term 'merged'. "
-                )
-                run_index = None  # remove warning from IDE
+            run_index = self._get_run_index(which, "get_output_path")
             return insert_suffix_before_extension(full_data_path, f"run{run_index}")
 
     def get_output_path(self, which="merged", **kwargs):
@@ -465,6 +484,7 @@ class ActorOutputUsingDataItemContainer(ActorOutputBase):
     # hints for IDE
     merge_data_after_simulation: bool
     keep_data_per_run: bool
+    parallel_write: bool
     data_item_config: Optional[Box]
 
     user_info_defaults = {
@@ -480,6 +500,14 @@ class ActorOutputUsingDataItemContainer(ActorOutputBase):
                 "doc": "In case the simulation has multiple runs, should separate results per run be kept?"
             },
         ),
+        "parallel_write": (
+            False,
+            {
+                "doc": "In case separate results per run are kept, should they be written to disk "
+                "in parallel threads? Each run is written to its own file(s), "
+                "so this can speed up writing many runs, e.g. large images, to disk. "
+            },
+        ),
     }
 
     # this intermediate base class defines a class attribute data_container_class,
@@ -534,7 +562,14 @@ class ActorOutputUsingDataItemContainer(ActorOutputBase):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.data_item_config = copy.deepcopy(self._default_data_item_config)
+        # the per-item config dictionaries only hold scalar values,
+        # so copying them one level deep is enough to isolate this instance
+        if self._default_data_item_config is None:
+            self.data_item_config = None
+        else:
+            self.data_item_config = {
+                k: dict(v) for k, v in self._default_data_item_config.items()
+            }
 
     def initialize_cpp_parameters(self):
         # Create structs on C++ side for this actor output
@@ -575,7 +610,7 @@ class ActorOutputUsingDataItemContainer(ActorOutputBase):
 
     def get_write_to_disk(self, item=0):
         items = self._collect_item_identifiers(item)
-        return any([self.data_item_config[k]["write_to_disk"] is True for k in items])
+        return any(self.data_item_config[k]["write_to_disk"] is True for k in items)
 
     def set_active(self, value, item=0):
         items = self._collect_item_identifiers(item)
@@ -586,7 +621,7 @@ class ActorOutputUsingDataItemContainer(ActorOutputBase):
         if item == "any":
             item = "all"
         items = self._collect_item_identifiers(item)
-        return any([self.data_item_config[k]["active"] is True for k in items])
+        return any(self.data_item_config[k]["active"] is True for k in items)
 
     def set_output_filename(self, value, item=0):
         if item == "all":
@@ -600,9 +635,7 @@ class ActorOutputUsingDataItemContainer(ActorOutputBase):
 
     def get_output_filename(self, item=0):
         if item == "all":
-            return dict(
-                [(k, self.get_output_filename(item=k)) for k in self.data_item_config]
-            )
+            return {k: self.get_output_filename(item=k) for k in self.data_item_config}
         else:
             try:
                 return self.data_item_config[item]["output_filename"]
@@ -611,9 +644,7 @@ class ActorOutputUsingDataItemContainer(ActorOutputBase):
 
     def get_item_suffix(self, item=0, **kwargs):
         if item == "all":
-            return dict(
-                [(k, self.get_item_suffix(item=k)) for k in self.data_item_config]
-            )
+            return {k: self.get_item_suffix(item=k) for k in self.data_item_config}
         else:
             try:
                 # FIXME: the .get() method implicitly defines a default value, but it should not. Is this a workaround?
@@ -642,12 +673,13 @@ class ActorOutputUsingDataItemContainer(ActorOutputBase):
 
     def _collect_item_identifiers(self, item):
         if item == "all":
-            items = list(self.data_item_config.keys())
+            # the keys of the config are known items by definition, no need to check them
+            return list(self.data_item_config)
         elif isinstance(item, (tuple, list)):
             items = item
         else:
             items = [item]
-        if not all([i in self.data_item_config for i in items]):
+        if not all(i in self.data_item_config for i in items):
             fatal(
                 f"Unknown items. Requested items are: {items}. "
                 f"Known items are {list(self.data_item_config.keys())}."
@@ -657,32 +689,24 @@ class ActorOutputUsingDataItemContainer(ActorOutputBase):
     def get_output_path(
         self, which="merged", item=0, always_return_dict=False, **kwargs
     ):
+        items = self._collect_item_identifiers(item)
+        # common case: a single item, so there is no need to collect the paths in a dict
+        if len(items) == 1 and always_return_dict is not True:
+            return super().get_output_path(which=which, item=items[0])
         return_dict = {}
-        for i in self._collect_item_identifiers(item):
+        for i in items:
             return_dict[i] = super().get_output_path(which=which, item=i)
-        if len(return_dict) > 1 or always_return_dict is True:
-            return return_dict
-        else:
-            return list(return_dict.values())[0]
+        return return_dict
 
     def get_data_container(self, which):
         if which == "merged":
             return self.merged_data
         else:
-            try:
-                run_index = int(which)  # might be a run_index
-                if (
-                    run_index in self.data_per_run
-                    and self.data_per_run[run_index] is not None
-                ):
-                    return self.data_per_run[run_index]
-                else:
-                    fatal(f"No data stored for run index {run_index}")
-            except ValueError:
-                fatal(
-                    f"Invalid argument 'which' in get_data_container() method of ActorOutput {self.name}. "
-                    f"Allowed values are: 'merged' or a valid run_index. "
-                )
+            run_index = self._get_run_index(which, "get_data_container")
+            data_container = self.data_per_run.get(run_index)
+            if data_container is None:
+                fatal(f"No data stored for run index {run_index}")
+            return data_container
 
     def get_data(self, which="merged", item=0):
         container = self.get_data_container(which)
@@ -696,8 +720,9 @@ class ActorOutputUsingDataItemContainer(ActorOutputBase):
         an already wrapped DataContainer class.
         """
 
-        if isinstance(data, self.data_container_class):
-            data_container = data
+        # data is always a tuple because of *data, so check its content
+        if len(data) == 1 and isinstance(data[0], self.data_container_class):
+            data_container = data[0]
             data_container.belongs_to = self
         else:
             data_container = self.data_container_class(belongs_to=self, data=data)
@@ -705,14 +730,7 @@ class ActorOutputUsingDataItemContainer(ActorOutputBase):
         if which == "merged":
             self.merged_data = data_container
         else:
-            try:
-                run_index = int(which)  # might be a run_index
-            except ValueError:
-                fatal(
-                    f"Invalid argument 'which' in store_data() method of ActorOutput {self.name}. "
-                    f"Allowed values are: 'merged' or a valid run_index. "
-                )
-                run_index = None  # avoid IDE warning
+            run_index = self._get_run_index(which, "store_data")
             self.data_per_run[run_index] = data_container
 
     def store_meta_data(self, which, **meta_data):
@@ -737,16 +755,10 @@ class ActorOutputUsingDataItemContainer(ActorOutputBase):
             data = list(self.data_per_run.values())
             identifiers = list(self.data_per_run.keys())
         elif which == "all":
-            data = list(self.data_per_run.values())
-            data.append(self.merged_data)
-            identifiers = list(self.data_per_run.keys())
-            identifiers.append("merged")
+            data = [*self.data_per_run.values(), self.merged_data]
+            identifiers = [*self.data_per_run.keys(), "merged"]
         else:
-            try:
-                ri = int(which)
-            except ValueError:
-                fatal(f"Invalid argument which in method collect_images(): {which}")
-                ri = None  # avoid IDE warning
+            ri = self._get_run_index(which, "collect_data")
             data = [self.data_per_run[ri]]
             identifiers = [ri]
         if return_identifier is True:
@@ -756,8 +768,22 @@ class ActorOutputUsingDataItemContainer(ActorOutputBase):
 
     def write_data(self, which="all", item="all", **kwargs):
         if which == "all_runs":
-            for k in self.data_per_run.keys():
-                self.write_data(which=k, item=item, **kwargs)
+            run_indices = list(self.data_per_run.keys())
+            if self.parallel_write is True and len(run_indices) > 1:
+                # runs are written to separate files, so they do not depend on each other
+                with ThreadPoolExecutor(
+                    max_workers=min(8, len(run_indices))
+                ) as executor:
+                    futures = [
+                        executor.submit(self.write_data, which=k, item=item, **kwargs)
+                        for k in run_indices
+                    ]
+                # re-raise any exception which occurred in one of the threads
+                for f in futures:
+                    f.result()
+            else:
+                for k in run_indices:
+                    self.write_data(which=k, item=item, **kwargs)
         elif which == "all":
             self.write_data(which="all_runs", item=item, **kwargs)
             self.write_data(which="merged", item=item, **kwargs)
@@ -771,23 +797,38 @@ class ActorOutputUsingDataItemContainer(ActorOutputBase):
                     )
 
     def write_data_if_requested(self, which="all", item="all", **kwargs):
+        # the items are validated once by _collect_item_identifiers(),
+        # so the flags can be read directly from the config
         items = [
             i
             for i in self._collect_item_identifiers(item)
-            if self.get_write_to_disk(item=i) is True
-            and self.get_active(item=i) is True
+            if self.data_item_config[i]["write_to_disk"] is True
+            and self.data_item_config[i]["active"] is True
             # FIXME: the active is True check should not be here. self.write_data() should handle that
         ]
         self.write_data(which=which, item=items)
 
     def merge_data_from_runs(self):
-        self.merged_data = merge_data(list(self.data_per_run.values()))
+        merged_data = merge_data(d for d in self.data_per_run.values() if d is not None)
+        # Without per-run data, e.g. because end_of_run() has already merged and released it
+        # (keep_data_per_run=False), there is nothing to merge: keep the current merged data.
+        if merged_data is not None:
+            self.merged_data = merged_data
 
     def end_of_run(self, run_index):
-        if self.merge_data_after_simulation is True:
-            self.merged_data.inplace_merge_with(self.data_per_run[run_index])
         if self.keep_data_per_run is False:
-            self.data_per_run.pop(run_index)
+            run_data = self.data_per_run.pop(run_index)
+        else:
+            run_data = self.data_per_run[run_index]
+        if self.merge_data_after_simulation is True:
+            if self.keep_data_per_run is False and all(
+                d is None or d.data_is_none for d in self.merged_data.data
+            ):
+                # Nothing merged yet and the run data is not kept:
+                # take over the run's container instead of copying its data
+                self.merged_data = run_data
+            else:
+                self.merged_data.inplace_merge_with(run_data)
 
     def start_of_simulation(self, **kwargs):
         if self.merge_data_after_simulation is True:
@@ -823,19 +864,14 @@ class ActorOutputImage(ActorOutputUsingDataItemContainer):
             if self.merged_data is not None:
                 return self.merged_data.get_image_properties()[item]
         else:
+            run_index = self._get_run_index(which, "get_image_properties")
             try:
-                run_index = int(which)
-                try:
-                    image_data_container = self.data_per_run[run_index]
-                except KeyError:
-                    fatal(f"No data found for run index {run_index}.")
-                    image_data_container = None  # avoid IDE warning
-                if image_data_container is not None:
-                    return image_data_container.get_image_properties()[item]
-            except ValueError:
-                fatal(
-                    f"Illegal argument 'which'. Provide a valid run index or the term 'merged'."
-                )
+                image_data_container = self.data_per_run[run_index]
+            except KeyError:
+                fatal(f"No data found for run index {run_index}.")
+                image_data_container = None  # avoid IDE warning
+            if image_data_container is not None:
+                return image_data_container.get_image_properties()[item]
 
     def create_empty_image(self, run_index, size, spacing, origin=None, **kwargs):
         if run_index not in self.data_per_run:
@@ -4,9 +4,11 @@ import json
 from box import Box
 
 from ..exception import fatal, warning, GateImplementationError
-from ..utility import ensure_filename_is_str, calculate_variance
+from ..utility import calculate_variance
 from ..image import (
     sum_itk_images,
+    add_itk_image_inplace,
+    copy_itk_image,
     divide_itk_images,
     multiply_itk_images,
     scale_itk_image,
@@ -27,8 +29,13 @@ class DataItem:
     if data writing is supposed to be handled on the python-side.
 
     Derived classes can also implement arithmetic operator like __add__, __mul__, etc.
+
+    Data items are created per run (and per item), so they use __slots__ instead of an instance __dict__.
+    Derived classes should declare __slots__ for any additional attribute (or an empty tuple).
     """
 
+    __slots__ = ("data", "meta_data")
+
     def __init__(self, *args, data=None, meta_data=None, **kwargs):
         self.data = None
         if data is not None:
@@ -131,6 +138,8 @@ class MeanValueDataItemMixin:
     overloaded methods take priority.
     """
 
+    __slots__ = ()
+
     # hints for IDE
     number_of_samples: int
 
@@ -147,8 +156,8 @@ class MeanValueDataItemMixin:
             self.number_of_samples = other.number_of_samples
         else:
             self *= self.number_of_samples
-            other *= other.number_of_samples
-            self += other
+            # weight other via a temporary so that the caller's data item is left untouched
+            self += other * other.number_of_samples
             self /= self.number_of_samples + other.number_of_samples
             self.number_of_samples = self.number_of_samples + other.number_of_samples
         return self
@@ -159,6 +168,8 @@ class ArithmeticDataItem(DataItem):
     Examples: Scalars, Numpy arrays, etc.
     """
 
+    __slots__ = ()
+
     def __iadd__(self, other):
         if self.data_is_none:
             raise ValueError(
@@ -217,12 +228,16 @@ class ArithmeticDataItem(DataItem):
 # data items holding arrays
 class ArrayDataItem(ArithmeticDataItem):
 
+    __slots__ = ()
+
     def set_data(self, data):
         super().set_data(np.asarray(data))
 
 
 class ScalarDataItem(ArithmeticDataItem):
 
+    __slots__ = ()
+
     def write(self, *args, **kwargs):
         raise NotImplementedError
 
@@ -230,13 +245,17 @@ class ScalarDataItem(ArithmeticDataItem):
 # data items holding images
 class ItkImageDataItem(DataItem):
 
+    __slots__ = ()
+
     @property
     def image(self):
         return self.data
 
     def inplace_merge_with(self, other):
         if self.data is None:
-            self.set_data(other.data)
+            # copy the image because subsequent merges add into its buffer in place
+            if other.data is not None:
+                self.set_data(copy_itk_image(other.data))
             self.number_of_samples = other.number_of_samples
         else:
             self.__iadd__(other)
@@ -245,7 +264,7 @@ class ItkImageDataItem(DataItem):
 
     def __iadd__(self, other):
         self._assert_data_is_not_none()
-        self.set_data(sum_itk_images([self.data, other.data]))
+        self.set_data(add_itk_image_inplace(self.data, other.data))
         return self
 
     def __add__(self, other):
@@ -311,7 +330,8 @@ class ItkImageDataItem(DataItem):
         )
 
     def write(self, path):
-        write_itk_image(self.data, ensure_filename_is_str(path))
+        # write_itk_image converts the path (str or Path) itself
+        write_itk_image(self.data, path)
 
 
 class MeanItkImageDataItem(MeanValueDataItemMixin, ItkImageDataItem):
@@ -319,6 +339,8 @@ class MeanItkImageDataItem(MeanValueDataItemMixin, ItkImageDataItem):
     The class MeanValueDataItemMixin therefore overloads the merge_with and inplace_merge_with methods.
     """
 
+    __slots__ = ()
+
 
 class DataContainer:
     """Common base class for all containers. Nothing implemented here for now."""
@@ -417,14 +439,13 @@ class DataItemContainer(DataContainer):
                     f"but {len(item)} items specified in the 'item' keyword argument. "
                 )
         else:
-            item = [i for i in range(len(data))]
+            item = range(len(data))
+        # resolve the data item class once per item and only wrap data
+        # which is not yet contained in the correct data item class
         processed_data = []
         for i, d in zip(item, data):
             c = self._data_item_classes[i]
-            if isinstance(d, c):
-                processed_data.append(d)
-            else:
-                processed_data.append(c(data=d))
+            processed_data.append(d if isinstance(d, c) else c(data=d))
         # Fill up the data list with None in case not all data were passed
         # processed_data.extend([None] * (len(self._data_item_classes) - len(data)))
         self.data = processed_data
@@ -456,7 +477,7 @@ class DataItemContainer(DataContainer):
 
     @property
     def data_is_none(self):
-        return any([d is None or d.data_is_none for d in self.data])
+        return any(d is None or d.data_is_none for d in self.data)
 
     def _assert_data_is_not_none(self):
         if self.data_is_none:
@@ -481,12 +502,14 @@ class DataItemContainer(DataContainer):
 
     def propagate_operator_inplace(self, other, operator):
         self._assert_data_is_not_none()
+        # the in-place operators of the data items modify them directly,
+        # so there is no need to collect and re-set the data
         if isinstance(other, (float, int)):
-            for i in range(self._tuple_length):
-                getattr(self.data[i], operator)(other)
+            for d in self.data:
+                getattr(d, operator)(other)
         else:
-            for i in range(self._tuple_length):
-                getattr(self.data[i], operator)(other.data[i])
+            for d, other_d in zip(self.data, other.data):
+                getattr(d, operator)(other_d)
         return self
 
     def __iadd__(self, other):
@@ -741,11 +764,25 @@ class QuotientMeanItkImage(QuotientItkImage):
 
 
 def merge_data(list_of_data):
-    merged_data = type(list_of_data[0])(
-        list_of_data[0].belongs_to, data=list_of_data[0].data
-    )
-    for d in list_of_data[1:]:
+    """Merge an iterable of data containers into a new container.
+    Returns None if the iterable is empty.
+    """
+    list_of_data = iter(list_of_data)
+    first = next(list_of_data, None)
+    if first is None:
+        return None
+    merged_data = None
+    for d in list_of_data:
+        if merged_data is None:
+            # start from an empty container rather than from the data items of the first entry
+            # because the merge modifies the data items in place
+            merged_data = type(first)(first.belongs_to)
+            merged_data.inplace_merge_with(first)
         merged_data.inplace_merge_with(d)
+    if merged_data is None:
+        # only one container, so there is nothing to merge (and nothing is modified in place).
+        # This also covers data items which do not implement inplace_merge_with, e.g. arrays
+        merged_data = type(first)(first.belongs_to, data=first.data)
     return merged_data
 
 
@@ -1,3 +1,4 @@
+import os
 import itk
 import numpy as np
 from box import Box
@@ -298,6 +299,13 @@ def compute_image_3D_CDF(image):
     return cdf_x, cdf_y, cdf_z
 
 
+def copy_itk_image(img):
+    # copy the pixel buffer (only once) and the image information
+    img2 = itk_image_from_array(itk.array_view_from_image(img), view=False)
+    img2.CopyInformation(img)
+    return img2
+
+
 def scale_itk_image(img, scale):
     imgarr = itk.array_view_from_image(img)
     imgarr = imgarr * scale
@@ -317,28 +325,65 @@ def divide_itk_images(
         fatal(
             f"Cannot divide images of different shape. Found {imgarr1.shape} vs. {imgarr2.shape}."
         )
-    imgarrOut = imgarr1.copy()
-    L_filterInv = imgarr2 != filterVal
-    imgarrOut[L_filterInv] = np.divide(imgarr1[L_filterInv], imgarr2[L_filterInv])
-
-    imgarrOut[np.invert(L_filterInv)] = replaceFilteredVal
+    # divide in a single pass, directly into the output array,
+    # without extracting the selected voxels into temporary arrays
+    imgarrOut = np.full_like(imgarr1, replaceFilteredVal)
+    np.divide(
+        imgarr1,
+        imgarr2,
+        out=imgarrOut,
+        where=imgarr2 != filterVal,
+        casting="unsafe",
+    )
     imgarrOut = itk_image_from_array(imgarrOut)
     imgarrOut.CopyInformation(img1_numerator)
     return imgarrOut
 
 
+def accumulate_image_array(summed_array, array):
+    """Add array to summed_array and return the sum.
+    The sum is written into summed_array if its dtype is what numpy would promote
+    the sum to. Otherwise, e.g. float32 + float64, a new (promoted) array is returned.
+    """
+    if array.shape != summed_array.shape:
+        fatal(
+            f"Cannot sum images of different shape. Found {summed_array.shape} vs. {array.shape}."
+        )
+    if np.result_type(summed_array.dtype, array.dtype) != summed_array.dtype:
+        return np.add(summed_array, array)
+    np.add(summed_array, array, out=summed_array)
+    return summed_array
+
+
 def sum_itk_images(itk_image_list):
     if not itk_image_list:
         raise ValueError("The image list is empty.")
+    # copy the first image once and accumulate all others into this buffer
+    # via array views, i.e. without allocating intermediate arrays
     summed_image = itk.GetArrayFromImage(itk_image_list[0])
     for itk_image in itk_image_list[1:]:
-        array = itk.GetArrayFromImage(itk_image)
-        summed_image = np.add(summed_image, array)
+        summed_image = accumulate_image_array(
+            summed_image, itk.array_view_from_image(itk_image)
+        )
     image = itk.GetImageFromArray(summed_image)
     image.CopyInformation(itk_image_list[0])
     return image
 
 
+def add_itk_image_inplace(img, other_img):
+    """Add other_img to img by writing directly into the pixel buffer of img.
+    The returned image is img itself, unless the pixel type of img cannot hold the sum.
+    In that case, a new image is returned, like sum_itk_images() does.
+    """
+    arr = itk.array_view_from_image(img)
+    summed_arr = accumulate_image_array(arr, itk.array_view_from_image(other_img))
+    if summed_arr is arr:
+        return img
+    image = itk.GetImageFromArray(summed_arr)
+    image.CopyInformation(img)
+    return image
+
+
 def multiply_itk_images(images):
     image_type = type(images[0])
     multiply_image_filter = itk.MultiplyImageFilter[
@@ -427,7 +472,7 @@ def compare_itk_image(filename1, filename2):
 def write_itk_image(img, file_path):
     # TODO: check if filepath exists
     # TODO: add metadata to file header
-    itk.imwrite(img, str(file_path))
+    itk.imwrite(img, os.fspath(file_path))
 
 
 def images_have_same_domain(image1, image2, tolerance=1e-5):
@@ -15,22 +15,18 @@ import numpy as np
 
 def define_run_timing_intervals(n):
     sec = gate.g4_units.second
-    start = 0
-    end = 1 * sec / n
-    run_timing_intervals = []
-    for r in range(n):
-        run_timing_intervals.append([start, end])
-        start = end
-        end += 1 * sec / n
+    # n contiguous intervals of equal length covering 1 sec,
+    # without accumulating rounding errors from repeated additions
+    edges = np.linspace(0, 1 * sec, n + 1)
+    run_timing_intervals = np.column_stack([edges[:-1], edges[1:]]).tolist()
 
     return run_timing_intervals
 
 
 def calculate_mean(edep_arr, unc_arr, edep_thresh_rel=0.7):
     edep_max = np.amax(edep_arr)
-    mask = edep_arr > edep_max * edep_thresh_rel
-    unc_used = unc_arr[mask]
-    unc_mean = np.mean(unc_used)
+    # masked mean, without extracting the selected voxels into a temporary array
+    unc_mean = np.mean(unc_arr, where=edep_arr > edep_max * edep_thresh_rel)
 
     return unc_mean
 
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+import itk
+import numpy as np
+
+import opengate as gate
+from opengate.tests import utility
+
+if __name__ == "__main__":
+    paths = utility.get_default_test_paths(
+        __file__, output_folder="test088_actor_output_parallel_write"
+    )
+
+    # create the simulation
+    sim = gate.Simulation()
+
+    # main options
+    sim.g4_verbose = False
+    sim.visu = False
+    sim.random_seed = 12345678
+    sim.output_dir = paths.output
+
+    # shortcuts for units
+    m = gate.g4_units.m
+    cm = gate.g4_units.cm
+    mm = gate.g4_units.mm
+    MeV = gate.g4_units.MeV
+    Bq = gate.g4_units.Bq
+    sec = gate.g4_units.second
+
+    #  change world size
+    world = sim.world
+    world.size = [1 * m, 1 * m, 1 * m]
+
+    # waterbox
+    waterbox = sim.add_volume("Box", "waterbox")
+    waterbox.size = [10 * cm, 10 * cm, 10 * cm]
+    waterbox.material = "G4_WATER"
+
+    # default source for tests
+    source = sim.add_source("GenericSource", "mysource")
+    source.energy.mono = 150 * MeV
+    source.particle = "proton"
+    source.position.type = "disc"
+    source.position.radius = 5 * mm
+    source.position.translation = [0, 0, -20 * cm]
+    source.direction.type = "momentum"
+    source.direction.momentum = [0, 0, 1]
+    source.activity = 2000 * Bq
+
+    # two identical dose actors, one writes the per-run data serially,
+    # the other one in parallel threads
+    dose_actors = []
+    for name, parallel_write in (("dose_serial", False), ("dose_parallel", True)):
+        dose = sim.add_actor("DoseActor", name)
+        dose.attached_to = "waterbox"
+        dose.size = [20, 20, 20]
+        dose.spacing = [5 * mm, 5 * mm, 5 * mm]
+        dose.edep.keep_data_per_run = True
+        dose.edep.parallel_write = parallel_write
+        dose.output_filename = f"{name}.mhd"
+        dose_actors.append(dose)
+
+    # several runs
+    n_runs = 4
+    sim.run_timing_intervals = [[i * sec, (i + 1) * sec] for i in range(n_runs)]
+
+    # start simulation
+    sim.run()
+
+    # tests
+    print()
+    is_ok = True
+    dose_serial, dose_parallel = dose_actors
+    b = dose_parallel.edep.parallel_write is True
+    utility.print_test(b, f"parallel_write is reachable via the interface: {b}")
+    is_ok = is_ok and b
+    for i in range(n_runs):
+        fn_serial = dose_serial.edep.get_output_path(which=i)
+        fn_parallel = dose_parallel.edep.get_output_path(which=i)
+        b = fn_parallel.name.endswith(f"-run{i}.mhd")
+        b = b and fn_serial.exists() and fn_parallel.exists()
+        utility.print_test(
+            b, f"Run {i}: per-run files {fn_serial.name}, {fn_parallel.name} exist: {b}"
+        )
+        is_ok = is_ok and b
+        if not b:
+            continue
+        arr_serial = itk.array_view_from_image(itk.imread(str(fn_serial)))
+        arr_parallel = itk.array_view_from_image(itk.imread(str(fn_parallel)))
+        b = np.array_equal(arr_serial, arr_parallel)
+        utility.print_test(
+            b, f"Run {i}: parallel output {fn_parallel.name} equals serial output: {b}"
+        )
+        is_ok = is_ok and b
+
+    utility.test_ok(is_ok)